@@ -1,20 +1,32 @@
 from __future__ import annotations
 
 import argparse
+import atexit
 import os
 import sys
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import groupby, islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
 
 import json
 from pathlib import Path
+from urllib.parse import quote_plus
 
-import requests
 from colorama import Fore, Style, init
 
-# Инициализация colorama для Windows
-init(autoreset=True)
+if TYPE_CHECKING:  # requests импортируется лениво, при первом запросе
+    import requests
+
+try:  # orjson разбирает байты напрямую и заметно быстрее stdlib json
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None
 
 API_URL = "https://api.openweathermap.org/data/2.5/weather"
 FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
@@ -28,11 +40,27 @@ DEFAULT_API_KEY = "28d56bf4dcd8a7981f7266b0779e38b9"
 CACHE_DIR = Path.home() / ".yonse_weather_cache"
 
 
+# Общая сессия создаётся при первом запросе (см. _get_session): импорт requests
+# занимает ~100 мс и не нужен для --help и ошибок в аргументах
+_SESSION: Optional["requests.Session"] = None
+# Погода и прогноз запрашиваются из пула потоков: без блокировки оба потока
+# успевают увидеть None и создать по собственной сессии
+_SESSION_LOCK = threading.Lock()
+
+# Кэш в памяти процесса поверх файлового: ключ кэша -> (время получения, данные)
+_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_CACHE_DIR_READY = False
+# init() оборачивает текущие sys.stdout/sys.stderr: повторный вызов добавил бы
+# ещё один слой обёртки со своим autoreset
+_COLORAMA_READY = False
+
+
 UNITS_LABELS: Dict[str, Tuple[str, str]] = {
     "metric": ("°C", "м/с"),
     "imperial": ("°F", "mph"),
     "standard": ("K", "м/с"),
 }
+_DEFAULT_UNITS_LABELS = ("°", "м/с")
 
 
 WEATHER_EMOJI = {
@@ -70,13 +98,89 @@ UV_LABELS = [
     (8, 10, "Очень высокий", Fore.LIGHTRED_EX),
     (11, float('inf'), "Экстремальный", Fore.RED),
 ]
+# Верхние границы полос UV_LABELS (кроме последней) и их подписи для bisect
+_UV_BREAKS = tuple(max_val for _, max_val, _, _ in UV_LABELS[:-1])
+_UV_BANDS = tuple((label, color) for _, _, label, color in UV_LABELS)
+
+
+# Цвет температуры: < 0, < 10, < 20, < 30 и всё, что выше
+_TEMPERATURE_BREAKS = (0, 10, 20, 30)
+_TEMPERATURE_COLORS = (Fore.BLUE, Fore.CYAN, Fore.GREEN, Fore.YELLOW, Fore.RED)
+
+# Готовые ANSI-префиксы: склеиваются один раз при импорте, а не в каждой строке
+_HEADER_STYLE = Fore.CYAN + Style.BRIGHT
+_ALERT_STYLE = Fore.RED + Style.BRIGHT
+_HIGHLIGHT = Fore.YELLOW
+_RESET = Style.RESET_ALL
+
+
+_WIND_DIRECTIONS = (
+    "С", "ССВ", "СВ", "ВСВ", "В", "ВЮВ", "ЮВ", "ЮЮВ",
+    "Ю", "ЮЮЗ", "ЮЗ", "ЗЮЗ", "З", "ЗСЗ", "СЗ", "ССЗ",
+)
+_WIND_ARROWS = ("↓", "↙", "←", "↖", "↑", "↗", "→", "↘")
+
+# Заготовки полоски влажности: нужная длина берётся срезом
+_BAR_MAX_WIDTH = 128
+_FULL_BAR = "█" * _BAR_MAX_WIDTH
+_EMPTY_BAR = "░" * _BAR_MAX_WIDTH
+
+
+# Подписи строк format_weather; ширина колонки считается один раз при импорте
+_WEATHER_ROW_LABELS = (
+    "🌤️  Кратко",
+    "🌡️  Температура",
+    "🤔 Ощущается как",
+    "📊 Давление",
+    "💧 Влажность",
+    "💨 Скорость ветра",
+    "🧭 Направление ветра",
+    "☁️  Облачность",
+    "🔽 Мин. температура",
+    "🔼 Макс. температура",
+    "👁️  Видимость",
+    "🌅 Восход",
+    "🌇 Закат",
+    "☀️  UV-индекс",
+    "🌬️  Качество воздуха",
+    "   • PM2.5",
+    "   • PM10",
+)
+_WEATHER_KEY_WIDTH = max(map(len, _WEATHER_ROW_LABELS))
+_WEATHER_ROW_PREFIXES = {
+    label: f"{label:<{_WEATHER_KEY_WIDTH}} : " for label in _WEATHER_ROW_LABELS
+}
+
+
+_REQUIRED = object()
+_MISSING = object()
+# Общий пустой блок для отсутствующих вложенных объектов ответа (только для чтения)
+_EMPTY_BLOCK: Dict[str, Any] = {}
+
+# Поля WeatherSnapshot из ответа API: (атрибут, путь в JSON, тип, значение по умолчанию)
+_WEATHER_SCHEMA: Tuple[Tuple[str, Tuple[str, ...], type, Any], ...] = (
+    ("temperature", ("main", "temp"), float, _REQUIRED),
+    ("feels_like", ("main", "feels_like"), float, _REQUIRED),
+    ("pressure", ("main", "pressure"), int, _REQUIRED),
+    ("humidity", ("main", "humidity"), int, _REQUIRED),
+    ("wind_speed", ("wind", "speed"), float, 0.0),
+    ("wind_direction", ("wind", "deg"), int, None),
+    ("cloudiness", ("clouds", "all"), int, 0),
+    ("temperature_min", ("main", "temp_min"), float, None),
+    ("temperature_max", ("main", "temp_max"), float, None),
+    ("visibility", ("visibility",), int, None),
+)
 
 
 class WeatherError(RuntimeError):
     """Пользовательская ошибка, означающая проблемы с получением прогноза."""
 
 
-@dataclass(frozen=True)
+# slots=True убирает __dict__ у экземпляров, но доступен только с Python 3.10
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class WeatherSnapshot:
     """Снимок погодных данных, полученных от OpenWeatherMap."""
 
@@ -103,7 +207,7 @@ class WeatherSnapshot:
     weather_alerts: Optional[List[Dict[str, Any]]] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_SLOTS)
 class ForecastItem:
     """Один элемент прогноза погоды."""
 
@@ -119,9 +223,40 @@ class ForecastItem:
     snow_volume: Optional[float] = None
 
 
+_PARSER: Optional[argparse.ArgumentParser] = None
+
+
 def parse_arguments(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
     """Разобрать аргументы командной строки."""
 
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    args = _PARSER.parse_args(list(argv) if argv is not None else None)
+
+    # Пакетный режим показывает только текущую погоду и не использует кэш:
+    # остальные параметры молча потерялись бы, поэтому сочетание запрещено
+    if args.cities:
+        ignored = [
+            name
+            for name, value in (
+                ("city", args.city),
+                ("--forecast", args.forecast),
+                ("--hourly", args.hourly),
+                ("--chart", args.chart),
+                ("--extended", args.extended),
+                ("--no-cache", args.no_cache),
+            )
+            if value
+        ]
+        if ignored:
+            _PARSER.error(f"--cities нельзя сочетать с: {', '.join(ignored)}")
+    return args
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Собрать парсер аргументов; создаётся один раз на процесс."""
+
     parser = argparse.ArgumentParser(
         description="Получение текущей погоды из OpenWeatherMap",
     )
@@ -185,115 +320,196 @@ def parse_arguments(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="Показать ASCII-график температуры",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--cities",
+        metavar="FILE",
+        help="Файл со списком городов (по одному в строке) для пакетного запроса",
+    )
+    return parser
 
 
 def main(argv: Optional[Iterable[str]] = None) -> int:
     """Точка входа для утилиты."""
 
     args = parse_arguments(argv)
+    use_color = not args.no_color
+    if use_color:
+        _ensure_colorama()
 
-    # Отключение colorama ес над
-    if args.no_color:
-        init(strip=True, convert=False)
+    if args.cities:
+        return run_batch(args)
 
     city = args.city or input("Введите название города: ").strip()
     if not city:
-        print("Название города не указано. Попробуйте снова.")
+        print("Название города не указано. Попробуйте снова.", file=sys.stderr)
         return 1
 
+    # Весь вывод собирается и пишется в stdout одним вызовом; ошибки идут в stderr
+    parts: List[str] = []
     try:
         api_key = resolve_api_key(args.api_key)
+        use_cache = not args.no_cache
 
-        # Основная погода
-        payload = fetch_weather(
-            city=city,
-            api_key=api_key,
-            units=args.units,
-            language=args.lang,
-            timeout=args.timeout,
-            use_cache=not args.no_cache,
-        )
-        snapshot = parse_weather_payload(payload, fallback_city=city, units=args.units)
-
-        # Расширенные данные
-        if args.extended:
-            try:
-                lat = payload.get("coord", {}).get("lat")
-                lon = payload.get("coord", {}).get("lon")
-                if lat and lon:
-                    
-                    air_data = fetch_air_quality(lat, lon, api_key, args.timeout)
-                    snapshot = add_air_quality_to_snapshot(snapshot, air_data)
-
-                    
-                    try:
-                        onecall_data = fetch_onecall(lat, lon, api_key, args.units, args.timeout)
-                        snapshot = add_uv_and_alerts_to_snapshot(snapshot, onecall_data)
-                    except WeatherError:
-                        pass  
-            except Exception as e:
-                print(f"{Fore.YELLOW}⚠️  Не удалось получить расширенные данные: {e}{Style.RESET_ALL}")
-
-        # Вывод текущей погоды
-        print(format_weather(snapshot, use_color=not args.no_color))
-
-        # Прогноз на несколько дней
-        if args.forecast:
-            forecast_data = fetch_forecast(
+        # Независимые запросы идут параллельно: ждём самый долгий, а не их сумму
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            weather_future = executor.submit(
+                fetch_weather,
                 city=city,
                 api_key=api_key,
                 units=args.units,
                 language=args.lang,
                 timeout=args.timeout,
-                use_cache=not args.no_cache,
+                use_cache=use_cache,
             )
-            forecast_items = parse_forecast_payload(forecast_data, snapshot.tz, args.units)
-            print("\n" + format_daily_forecast(forecast_items, args.units, use_color=not args.no_color))
+            forecast_future = None
+            need_forecast = args.forecast or args.hourly or args.chart
+            if need_forecast:
+                forecast_future = executor.submit(
+                    fetch_forecast,
+                    city=city,
+                    api_key=api_key,
+                    units=args.units,
+                    language=args.lang,
+                    timeout=args.timeout,
+                    use_cache=use_cache,
+                )
+
+            # Основная погода
+            payload = weather_future.result()
+            snapshot = parse_weather_payload(payload, fallback_city=city, units=args.units)
+
+            # Расширенные данные: координаты известны только после основного запроса
+            if args.extended:
+                try:
+                    lat = payload.get("coord", {}).get("lat")
+                    lon = payload.get("coord", {}).get("lon")
+                    if lat and lon:
+                        air_future = executor.submit(
+                            fetch_air_quality, lat, lon, api_key, args.timeout
+                        )
+                        onecall_future = executor.submit(
+                            fetch_onecall, lat, lon, api_key, args.units, args.timeout
+                        )
+                        snapshot = add_air_quality_to_snapshot(snapshot, air_future.result())
+
+                        try:
+                            snapshot = add_uv_and_alerts_to_snapshot(
+                                snapshot, onecall_future.result()
+                            )
+                        except WeatherError:
+                            pass
+                except Exception as e:
+                    print(
+                        _colorize(f"⚠️  Не удалось получить расширенные данные: {e}", Fore.YELLOW, use_color),
+                        file=sys.stderr,
+                    )
+
+            # Вывод текущей погоды
+            parts.append(format_weather(snapshot, use_color=use_color))
+
+            # Прогноз запрашивается и разбирается один раз для всех режимов
+            if need_forecast:
+                forecast_items = parse_forecast_payload(forecast_future.result(), snapshot.tz, args.units)
+
+                # Прогноз на несколько дней
+                if args.forecast:
+                    parts.append(format_daily_forecast(forecast_items, args.units, use_color=use_color))
+
+                # Почасовой прогноз
+                if args.hourly:
+                    parts.append(format_hourly_forecast(forecast_items, args.units, use_color=use_color))
+
+                if args.chart:
+                    chart = create_temperature_chart(forecast_items)
+                    if chart:
+                        parts.append(chart)
+
+        parts.append(_colorize("✨ Спасибо за использование YonSeWeather! ✨", Fore.CYAN, use_color))
+    except WeatherError as exc:
+        print(_colorize(f"❌ Ошибка: {exc}", Fore.RED, use_color), file=sys.stderr)
+        return 1
+    finally:
+        _write_output(parts)
 
-        # Почасовой прогноз
-        if args.hourly:
-            forecast_data = fetch_forecast(
-                city=city,
-                api_key=api_key,
-                units=args.units,
-                language=args.lang,
-                timeout=args.timeout,
-                use_cache=not args.no_cache,
-            )
-            forecast_items = parse_forecast_payload(forecast_data, snapshot.tz, args.units)
-            print("\n" + format_hourly_forecast(forecast_items, args.units, use_color=not args.no_color))
+    return 0
 
-            
-            if args.chart:
-                chart = create_temperature_chart(forecast_items)
-                if chart:
-                    print("\n" + chart)
 
-        
-        elif args.chart and args.forecast:
-            forecast_data = fetch_forecast(
-                city=city,
-                api_key=api_key,
-                units=args.units,
-                language=args.lang,
-                timeout=args.timeout,
-                use_cache=not args.no_cache,
-            )
-            forecast_items = parse_forecast_payload(forecast_data, snapshot.tz, args.units)
-            chart = create_temperature_chart(forecast_items)
-            if chart:
-                print("\n" + chart)
+def run_batch(args: argparse.Namespace) -> int:
+    """Показать текущую погоду для всех городов из файла ``--cities``."""
 
-    except WeatherError as exc:
-        print(f"{Fore.RED}❌ Ошибка: {exc}{Style.RESET_ALL}")
+    use_color = not args.no_color
+
+    try:
+        lines = Path(args.cities).read_text(encoding="utf-8").splitlines()
+    except OSError as exc:
+        print(_colorize(f"❌ Не удалось прочитать файл городов: {exc}", Fore.RED, use_color), file=sys.stderr)
         return 1
-    except requests.RequestException as exc:
-        print(f"{Fore.RED}❌ Не удалось выполнить запрос: {exc}{Style.RESET_ALL}")
+
+    cities = [line.strip() for line in lines if line.strip()]
+    if not cities:
+        print("Список городов пуст. Попробуйте снова.", file=sys.stderr)
         return 1
 
-    print(f"\n{Fore.CYAN}✨ Спасибо за использование YonSeWeather! ✨{Style.RESET_ALL}")
-    return 0
+    try:
+        import asyncio
+
+        from weather_async import fetch_many
+    except ImportError:
+        print(_colorize("❌ Для --cities нужен пакет aiohttp: pip install aiohttp", Fore.RED, use_color), file=sys.stderr)
+        return 1
+
+    try:
+        api_key = resolve_api_key(args.api_key)
+    except WeatherError as exc:
+        print(_colorize(f"❌ Ошибка: {exc}", Fore.RED, use_color), file=sys.stderr)
+        return 1
+
+    # weather_async не импортирует main: URL, разбор ответа и класс ошибки
+    # передаются отсюда, иначе при запуске как скрипта модуль загрузился бы дважды
+    results = asyncio.run(
+        fetch_many(
+            cities,
+            url=API_URL,
+            decode=_parse_api_body,
+            error_type=WeatherError,
+            api_key=api_key,
+            units=args.units,
+            language=args.lang,
+            timeout=args.timeout,
+        )
+    )
+
+    exit_code = 0
+    parts: List[str] = []
+    for city, result in zip(cities, results):
+        if isinstance(result, WeatherError):
+            print(_colorize(f"❌ {city}: {result}", Fore.RED, use_color), file=sys.stderr)
+            exit_code = 1
+            continue
+        try:
+            snapshot = parse_weather_payload(result, fallback_city=city, units=args.units)
+        except WeatherError as exc:
+            print(_colorize(f"❌ {city}: {exc}", Fore.RED, use_color), file=sys.stderr)
+            exit_code = 1
+            continue
+        parts.append(format_weather(snapshot, use_color=use_color))
+
+    parts.append(_colorize("✨ Спасибо за использование YonSeWeather! ✨", Fore.CYAN, use_color))
+    _write_output(parts)
+    return exit_code
+
+
+def _write_output(parts: List[str]) -> None:
+    """Вывести блоки, разделяя их пустой строкой, одной записью в stdout."""
+
+    if parts:
+        sys.stdout.write("\n\n".join(parts) + "\n")
+
+
+def _colorize(text: str, color: str, use_color: bool) -> str:
+    """Окрасить текст, только если цветной вывод включён."""
+
+    return f"{color}{text}{_RESET}" if use_color else text
 
 
 def resolve_api_key(cli_key: Optional[str]) -> str:
@@ -308,35 +524,133 @@ def resolve_api_key(cli_key: Optional[str]) -> str:
     return api_key
 
 
+def _get_session() -> "requests.Session":
+    """Вернуть общую HTTP-сессию, создав её при первом обращении.
+
+    Keep-alive и пул соединений избавляют от повторного TLS-рукопожатия,
+    а временные ошибки шлюза повторяются с небольшой задержкой.
+    """
+
+    global _SESSION
+    if _SESSION is not None:
+        return _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            session.mount(
+                "https://",
+                HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=8,
+                    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+                ),
+            )
+            atexit.register(session.close)
+            _SESSION = session
+    return _SESSION
+
+
+def _http_get(
+    url: str,
+    *,
+    timeout: float,
+    error_message: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> "requests.Response":
+    """Выполнить GET через общую сессию, превратив сетевую ошибку в WeatherError.
+
+    Ответ запрашивается с ``stream=True``: тело читает :func:`decode_response`.
+    """
+
+    session = _get_session()
+    # requests к этому моменту уже импортирован в _get_session
+    from requests import RequestException
+
+    try:
+        return session.get(url, params=params, timeout=timeout, stream=True)
+    except RequestException as exc:  # pragma: no cover - сетевые ошибки
+        raise WeatherError(error_message) from exc
+
+
+def _ensure_colorama() -> None:
+    """Инициализировать colorama (нужно для Windows) один раз за процесс.
+
+    Вызывается только при цветном выводе: обёртка stdout/stderr с autoreset
+    дописывает сброс стиля после каждой записи, и без цвета она не нужна.
+    """
+    global _COLORAMA_READY
+    if not _COLORAMA_READY:
+        init(autoreset=True)
+        _COLORAMA_READY = True
+
+
+def close_session() -> None:
+    """Закрыть HTTP-сессию и освободить соединения из пула."""
+
+    if _SESSION is not None:
+        _SESSION.close()
+
+
+def clear_cache() -> None:
+    """Очистить кэш ответов в памяти процесса (файловый кэш не затрагивается)."""
+
+    _CACHE.clear()
+
+
 def get_cache_path(cache_key: str) -> Path:
     """Получить путь к файлу кэша."""
-    CACHE_DIR.mkdir(exist_ok=True)
     return CACHE_DIR / f"{cache_key}.json"
 
 
+def _ensure_cache_dir() -> None:
+    """Создать каталог кэша при первой записи; дальше без лишних системных вызовов."""
+    global _CACHE_DIR_READY
+    if not _CACHE_DIR_READY:
+        CACHE_DIR.mkdir(exist_ok=True)
+        _CACHE_DIR_READY = True
+
+
 def load_from_cache(cache_key: str, max_age_minutes: int = 10) -> Optional[Dict[str, Any]]:
     """Загрузить данные из кэша, если они не устарели."""
-    cache_path = get_cache_path(cache_key)
-    if not cache_path.exists():
-        return None
+    entry = _CACHE.get(cache_key)
+    if entry is not None and time.time() - entry[0] <= max_age_minutes * 60:
+        return entry[1]
 
+    # Один open() и fstat() по дескриптору вместо exists() + stat() + open()
     try:
-        cache_age = datetime.now().timestamp() - cache_path.stat().st_mtime
-        if cache_age > max_age_minutes * 60:
-            return None
-
-        with cache_path.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except (IOError, json.JSONDecodeError):
+        with get_cache_path(cache_key).open("rb") as f:
+            saved_at = os.fstat(f.fileno()).st_mtime
+            if time.time() - saved_at > max_age_minutes * 60:
+                return None
+            data = _json_loads(f.read())
+    except (IOError, ValueError):
         return None
+    _CACHE[cache_key] = (saved_at, data)
+    return data
 
 
 def save_to_cache(cache_key: str, data: Dict[str, Any]) -> None:
     """Сохранить данные в кэш."""
+    _CACHE[cache_key] = (time.time(), data)
     try:
+        _ensure_cache_dir()
         cache_path = get_cache_path(cache_key)
-        with cache_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Запись через временный файл: прерванная запись не оставит битый кэш.
+        # Имя уникально для процесса и потока, чтобы параллельные запуски CLI
+        # с одним ключом не обрезали временный файл друг друга
+        tmp_path = cache_path.with_name(
+            f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            tmp_path.write_bytes(_json_dumps(data))
+            os.replace(tmp_path, cache_path)
+        except IOError:
+            tmp_path.unlink(missing_ok=True)
+            raise
     except IOError:
         pass  
 
@@ -352,23 +666,15 @@ def fetch_weather(
 ) -> Dict[str, Any]:
     """Выполнить запрос к OpenWeatherMap и вернуть результат в виде словаря."""
 
-    cache_key = f"weather_{city}_{units}_{language}"
+    cache_key = f"weather_{city.casefold()}_{units}_{language}"
     if use_cache:
         cached = load_from_cache(cache_key)
         if cached:
             return cached
 
-    params = {
-        "q": city,
-        "appid": api_key,
-        "units": units,
-        "lang": language,
-    }
+    url = _build_url(API_URL, api_key, units, language).replace("{city}", quote_plus(city))
 
-    try:
-        response = requests.get(API_URL, params=params, timeout=timeout)
-    except requests.RequestException as exc:  # pragma: no cover - сетевые ошибки
-        raise WeatherError("Не удалось связаться с OpenWeatherMap") from exc
+    response = _http_get(url, timeout=timeout, error_message="Не удалось связаться с OpenWeatherMap")
 
     data = decode_response(response)
     check_for_api_error(data, response.status_code)
@@ -390,23 +696,15 @@ def fetch_forecast(
 ) -> Dict[str, Any]:
     """Получить прогноз погоды на 5 дней."""
 
-    cache_key = f"forecast_{city}_{units}_{language}"
+    cache_key = f"forecast_{city.casefold()}_{units}_{language}"
     if use_cache:
         cached = load_from_cache(cache_key, max_age_minutes=30)
         if cached:
             return cached
 
-    params = {
-        "q": city,
-        "appid": api_key,
-        "units": units,
-        "lang": language,
-    }
+    url = _build_url(FORECAST_URL, api_key, units, language).replace("{city}", quote_plus(city))
 
-    try:
-        response = requests.get(FORECAST_URL, params=params, timeout=timeout)
-    except requests.RequestException as exc:
-        raise WeatherError("Не удалось получить прогноз погоды") from exc
+    response = _http_get(url, timeout=timeout, error_message="Не удалось получить прогноз погоды")
 
     data = decode_response(response)
     check_for_api_error(data, response.status_code)
@@ -426,10 +724,12 @@ def fetch_air_quality(lat: float, lon: float, api_key: str, timeout: float) -> D
         "appid": api_key,
     }
 
-    try:
-        response = requests.get(AIR_QUALITY_URL, params=params, timeout=timeout)
-    except requests.RequestException as exc:
-        raise WeatherError("Не удалось получить данные о качестве воздуха") from exc
+    response = _http_get(
+        AIR_QUALITY_URL,
+        params=params,
+        timeout=timeout,
+        error_message="Не удалось получить данные о качестве воздуха",
+    )
 
     data = decode_response(response)
     return data
@@ -448,29 +748,80 @@ def fetch_onecall(
         "exclude": "minutely",
     }
 
-    try:
-        response = requests.get(ONECALL_URL, params=params, timeout=timeout)
-    except requests.RequestException as exc:
-        raise WeatherError("Не удалось получить данные OneCall") from exc
+    response = _http_get(
+        ONECALL_URL, params=params, timeout=timeout, error_message="Не удалось получить данные OneCall"
+    )
 
     data = decode_response(response)
     check_for_api_error(data, response.status_code)
     return data
 
 
+@lru_cache(maxsize=8)
+def _build_url(base_url: str, api_key: str, units: str, language: str) -> str:
+    """Собрать URL запроса по городу с заполнителем ``{city}`` вместо названия."""
+
+    return (
+        f"{base_url}?appid={quote_plus(api_key)}&units={quote_plus(units)}"
+        f"&lang={quote_plus(language)}&q={{city}}"
+    )
+
+
 def decode_response(response: requests.Response) -> Dict[str, Any]:
-    """Преобразовать ответ в JSON и обработать ошибки."""
+    """Преобразовать ответ в JSON и обработать ошибки.
+
+    Запросы выполняются с ``stream=True``, поэтому тело читается напрямую из
+    ``response.raw`` без промежуточной копии в ``response.content``.
+    """
+
+    from urllib3.exceptions import HTTPError as Urllib3Error
+
+    try:
+        body = response.raw.read(decode_content=True)
+    except (Urllib3Error, OSError) as exc:
+        raise WeatherError("Не удалось получить ответ OpenWeatherMap") from exc
+    finally:
+        response.close()
 
     try:
-        return response.json()
+        return _json_loads(body)
     except ValueError as exc:
         raise WeatherError("Не удалось разобрать ответ OpenWeatherMap") from exc
 
 
+def _parse_api_body(body: bytes, status_code: int) -> Dict[str, Any]:
+    """Разобрать уже прочитанное тело ответа и проверить его на ошибку API."""
+
+    try:
+        data = _json_loads(body)
+    except ValueError as exc:
+        raise WeatherError("Не удалось разобрать ответ OpenWeatherMap") from exc
+    check_for_api_error(data, status_code)
+    return data
+
+
+def _json_loads(data: bytes) -> Any:
+    """Разобрать JSON из байтов, используя orjson при наличии."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Сериализовать данные в JSON (UTF-8), используя orjson при наличии."""
+
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
 def check_for_api_error(payload: Dict[str, Any], status_code: int) -> None:
     """Проверить, что API не вернуло ошибку."""
 
     code = payload.get("cod", status_code)
+    if code == 200 or code == "200":
+        return
     try:
         numeric_code = int(code)
     except (TypeError, ValueError) as exc:
@@ -489,123 +840,68 @@ def parse_weather_payload(
 ) -> WeatherSnapshot:
     """Построить :class:`WeatherSnapshot` из словаря с данными погоды."""
 
-    try:
-        main_block = payload["main"]
-        sys_block = payload["sys"]
-    except KeyError as exc:
-        raise WeatherError("Ответ не содержит необходимых данных") from exc
+    if "main" not in payload or "sys" not in payload:
+        raise WeatherError("Ответ не содержит необходимых данных")
+    sys_block = payload["sys"]
 
     weather_list: List[Dict[str, Any]] = payload.get("weather") or []
     weather_details = weather_list[0] if weather_list else {}
     description = _format_description(weather_details.get("description"))
 
-    timezone_offset = payload.get("timezone", 0)
-    tz = timezone(timedelta(seconds=timezone_offset))
+    tz = _tz_for(payload.get("timezone", 0))
 
     sunrise = _to_local_time(sys_block.get("sunrise"), tz)
     sunset = _to_local_time(sys_block.get("sunset"), tz)
 
-    temperature = _required_float(main_block, "temp")
-    feels_like = _required_float(main_block, "feels_like")
-    pressure = _required_int(main_block, "pressure")
-    humidity = _required_int(main_block, "humidity")
-    wind_speed = _float_with_default(_safe_get(payload.get("wind"), "speed"), default=0.0)
-    wind_direction = _optional_int(_safe_get(payload.get("wind"), "deg"))
-    cloudiness = _int_with_default(_safe_get(payload.get("clouds"), "all"), default=0)
-    temperature_min = _float_with_default(main_block.get("temp_min"), default=temperature)
-    temperature_max = _float_with_default(main_block.get("temp_max"), default=temperature)
-    visibility = _optional_int(payload.get("visibility"))
+    fields = _extract(payload, _WEATHER_SCHEMA)
+    for bound in ("temperature_min", "temperature_max"):
+        if fields[bound] is None:
+            fields[bound] = fields["temperature"]
 
     snapshot = WeatherSnapshot(
         city=payload.get("name") or fallback_city,
         country=sys_block.get("country"),
         description=description,
-        temperature=temperature,
-        feels_like=feels_like,
-        pressure=pressure,
-        humidity=humidity,
-        wind_speed=wind_speed,
-        wind_direction=wind_direction,
-        cloudiness=cloudiness,
-        temperature_min=temperature_min,
-        temperature_max=temperature_max,
-        visibility=visibility,
         sunrise=sunrise,
         sunset=sunset,
         tz=tz,
         units=units,
+        **fields,
     )
     return snapshot
 
 
-def _safe_get(block: Optional[Dict[str, Any]], key: str, default: Any = None) -> Any:
-    """Безопасно получить значение из словаря, возвращая ``default`` если словарь пуст."""
-
-    if not isinstance(block, dict):
-        return default
-    return block.get(key, default)
-
-
-def _optional_int(value: Any) -> Optional[int]:
-    """Преобразовать значение в ``int`` или вернуть ``None``."""
-
-    if value is None:
-        return None
-    try:
-        return int(value)
-    except (TypeError, ValueError) as exc:
-        raise WeatherError(f"Ожидалось целое число, получено {value!r}") from exc
-
-
-def _required_float(block: Dict[str, Any], key: str) -> float:
-    """Получить обязательное значение ``float`` из словаря."""
-
-    try:
-        value = block[key]
-    except KeyError as exc:
-        raise WeatherError(f"Ответ не содержит поле {key!r}") from exc
-    try:
-        return float(value)
-    except (TypeError, ValueError) as exc:
-        raise WeatherError(f"Некорректное значение в поле {key!r}: {value!r}") from exc
-
-
-def _required_int(block: Dict[str, Any], key: str) -> int:
-    """Получить обязательное значение ``int`` из словаря."""
-
-    try:
-        value = block[key]
-    except KeyError as exc:
-        raise WeatherError(f"Ответ не содержит поле {key!r}") from exc
-    try:
-        return int(value)
-    except (TypeError, ValueError) as exc:
-        raise WeatherError(f"Некорректное значение в поле {key!r}: {value!r}") from exc
-
-
-def _optional_float(value: Any) -> Optional[float]:
-    """Преобразовать значение в ``float`` или вернуть ``None``."""
-
-    if value is None:
-        return None
-    try:
-        return float(value)
-    except (TypeError, ValueError) as exc:
-        raise WeatherError(f"Некорректное значение: {value!r}") from exc
-
-
-def _float_with_default(value: Any, *, default: float) -> float:
-    """Вернуть ``float`` с использованием значения по умолчанию."""
-
-    coerced = _optional_float(value)
-    return default if coerced is None else coerced
-
-
-def _int_with_default(value: Any, *, default: int) -> int:
-    """Вернуть ``int`` с использованием значения по умолчанию."""
-
-    coerced = _optional_int(value)
-    return default if coerced is None else coerced
+def _extract(
+    payload: Dict[str, Any],
+    schema: Tuple[Tuple[str, Tuple[str, ...], type, Any], ...],
+) -> Dict[str, Any]:
+    """Извлечь поля ответа по схеме за один проход, приводя значения к нужному типу."""
+
+    # Глобальные имена привязаны к локальным: в цикле это LOAD_FAST вместо LOAD_GLOBAL
+    get = dict.get
+    is_instance = isinstance
+    missing = _MISSING
+    required = _REQUIRED
+    fields: Dict[str, Any] = {}
+    for attr, path, convert, default in schema:
+        value = payload
+        for key in path:
+            value = get(value, key, missing) if is_instance(value, dict) else missing
+
+        if value is None or value is missing:
+            if default is not required:
+                fields[attr] = default
+                continue
+            if value is missing:
+                raise WeatherError(f"Ответ не содержит поле {path[-1]!r}")
+
+        try:
+            fields[attr] = convert(value)
+        except (TypeError, ValueError) as exc:
+            raise WeatherError(
+                f"Некорректное значение в поле {path[-1]!r}: {value!r}"
+            ) from exc
+    return fields
 
 
 def _format_description(description: Optional[str]) -> str:
@@ -613,7 +909,16 @@ def _format_description(description: Optional[str]) -> str:
 
     if not description:
         return "Нет данных"
-    return description.strip().capitalize()
+    # Описания OWM приходят в нижнем регистре: достаточно поднять первую букву
+    description = description.strip()
+    return description[:1].upper() + description[1:] if description else "Нет данных"
+
+
+@lru_cache(maxsize=64)
+def _tz_for(offset: int) -> timezone:
+    """Вернуть объект ``timezone`` для смещения в секундах (кэшируется)."""
+
+    return timezone(timedelta(seconds=offset))
 
 
 def _to_local_time(timestamp: Optional[int], tz: timezone) -> Optional[datetime]:
@@ -621,54 +926,49 @@ def _to_local_time(timestamp: Optional[int], tz: timezone) -> Optional[datetime]
 
     if timestamp is None:
         return None
-    return datetime.fromtimestamp(timestamp, tz=timezone.utc).astimezone(tz)
+    return datetime.fromtimestamp(timestamp, tz=tz)
 
 
 def format_weather(snapshot: WeatherSnapshot, use_color: bool = True) -> str:
     """Превратить погодный снимок в красиво оформленный текст."""
 
-    temp_unit, wind_unit = UNITS_LABELS.get(snapshot.units, ("°", "м/с"))
+    temp_unit, wind_unit = UNITS_LABELS.get(snapshot.units, _DEFAULT_UNITS_LABELS)
     location = snapshot.city
     if snapshot.country:
         location = f"{location}, {snapshot.country}"
 
     
-    emoji = WEATHER_EMOJI.get(snapshot.description.lower(), "🌈")
+    emoji = _weather_emoji(snapshot.description)
     header = f"{emoji} Погода от YonSe в городе {location}"
     if use_color:
-        header = f"{Fore.CYAN}{Style.BRIGHT}{header}{Style.RESET_ALL}"
+        header = f"{_HEADER_STYLE}{header}{_RESET}"
 
     timezone_label = _format_timezone(snapshot.tz)
 
     
-    temp_color = Fore.WHITE
+    # Без цвета ANSI-коды не подставляются вовсе, а не вырезаются colorama при выводе
+    temp_color = ""
+    temp_reset = ""
     if use_color:
-        if snapshot.temperature < 0:
-            temp_color = Fore.BLUE
-        elif snapshot.temperature < 10:
-            temp_color = Fore.CYAN
-        elif snapshot.temperature < 20:
-            temp_color = Fore.GREEN
-        elif snapshot.temperature < 30:
-            temp_color = Fore.YELLOW
-        else:
-            temp_color = Fore.RED
+        temp_color = _TEMPERATURE_COLORS[bisect_right(_TEMPERATURE_BREAKS, snapshot.temperature)]
+        temp_reset = _RESET
 
     
     humidity_bar = create_humidity_bar(snapshot.humidity, width=25)
     wind_arrow = create_wind_arrow(snapshot.wind_direction) if snapshot.wind_direction is not None else ""
 
-    rows: List[Tuple[str, str, str]] = [
-        ("🌤️  Кратко", snapshot.description, Fore.WHITE),
-        ("🌡️  Температура", f"{temp_color}{snapshot.temperature:.1f} {temp_unit}{Style.RESET_ALL if use_color else ''}", Fore.WHITE),
-        ("🤔 Ощущается как", f"{temp_color}{snapshot.feels_like:.1f} {temp_unit}{Style.RESET_ALL if use_color else ''}", Fore.WHITE),
+    rows: List[Tuple[str, str, str, bool]] = [
+        ("🌤️  Кратко", snapshot.description, Fore.WHITE, False),
+        ("🌡️  Температура", f"{temp_color}{snapshot.temperature:.1f} {temp_unit}{temp_reset}", Fore.WHITE, True),
+        ("🤔 Ощущается как", f"{temp_color}{snapshot.feels_like:.1f} {temp_unit}{temp_reset}", Fore.WHITE, True),
         (
             "📊 Давление",
-            f"{snapshot.pressure} гПа (~{snapshot.pressure * 0.75006:.0f} мм рт. ст.)",
+            f"{snapshot.pressure} гПа (~{(snapshot.pressure * 75006 + 50000) // 100000} мм рт. ст.)",
             Fore.WHITE,
+            False,
         ),
-        ("💧 Влажность", humidity_bar, Fore.LIGHTBLUE_EX if use_color else Fore.WHITE),
-        ("💨 Скорость ветра", f"{snapshot.wind_speed:.1f} {wind_unit}", Fore.LIGHTCYAN_EX if use_color else Fore.WHITE),
+        ("💧 Влажность", humidity_bar, Fore.LIGHTBLUE_EX, False),
+        ("💨 Скорость ветра", f"{snapshot.wind_speed:.1f} {wind_unit}", Fore.LIGHTCYAN_EX, False),
     ]
 
     if snapshot.wind_direction is not None:
@@ -677,24 +977,25 @@ def format_weather(snapshot: WeatherSnapshot, use_color: bool = True) -> str:
                 "🧭 Направление ветра",
                 f"{wind_arrow} {snapshot.wind_direction}° ({_format_wind_direction(snapshot.wind_direction)})",
                 Fore.WHITE,
+                False,
             )
         )
 
     rows.extend(
         [
-            ("☁️  Облачность", f"{snapshot.cloudiness}%", Fore.WHITE),
-            ("🔽 Мин. температура", f"{snapshot.temperature_min:.1f} {temp_unit}", Fore.BLUE if use_color else Fore.WHITE),
-            ("🔼 Макс. температура", f"{snapshot.temperature_max:.1f} {temp_unit}", Fore.RED if use_color else Fore.WHITE),
+            ("☁️  Облачность", f"{snapshot.cloudiness}%", Fore.WHITE, False),
+            ("🔽 Мин. температура", f"{snapshot.temperature_min:.1f} {temp_unit}", Fore.BLUE, False),
+            ("🔼 Макс. температура", f"{snapshot.temperature_max:.1f} {temp_unit}", Fore.RED, False),
         ]
     )
 
     if snapshot.visibility is not None:
-        rows.append(("👁️  Видимость", _format_visibility(snapshot.visibility), Fore.WHITE))
+        rows.append(("👁️  Видимость", _format_visibility(snapshot.visibility), Fore.WHITE, False))
 
     rows.extend(
         [
-            ("🌅 Восход", _format_time(snapshot.sunrise, timezone_label), Fore.LIGHTYELLOW_EX if use_color else Fore.WHITE),
-            ("🌇 Закат", _format_time(snapshot.sunset, timezone_label), Fore.LIGHTMAGENTA_EX if use_color else Fore.WHITE),
+            ("🌅 Восход", _format_time(snapshot.sunrise, timezone_label), Fore.LIGHTYELLOW_EX, False),
+            ("🌇 Закат", _format_time(snapshot.sunset, timezone_label), Fore.LIGHTMAGENTA_EX, False),
         ]
     )
 
@@ -703,8 +1004,8 @@ def format_weather(snapshot: WeatherSnapshot, use_color: bool = True) -> str:
         uv_label, uv_color = get_uv_label(snapshot.uv_index)
         uv_str = f"{snapshot.uv_index:.1f} ({uv_label})"
         if use_color:
-            uv_str = f"{uv_color}{uv_str}{Style.RESET_ALL}"
-        rows.append(("☀️  UV-индекс", uv_str, Fore.WHITE))
+            uv_str = f"{uv_color}{uv_str}{_RESET}"
+        rows.append(("☀️  UV-индекс", uv_str, Fore.WHITE, True))
 
     if snapshot.air_quality_index is not None:
         aqi_label, aqi_color = AIR_QUALITY_LABELS.get(
@@ -712,32 +1013,37 @@ def format_weather(snapshot: WeatherSnapshot, use_color: bool = True) -> str:
         )
         aqi_str = f"{snapshot.air_quality_index} ({aqi_label})"
         if use_color:
-            aqi_str = f"{aqi_color}{aqi_str}{Style.RESET_ALL}"
-        rows.append(("🌬️  Качество воздуха", aqi_str, Fore.WHITE))
+            aqi_str = f"{aqi_color}{aqi_str}{_RESET}"
+        rows.append(("🌬️  Качество воздуха", aqi_str, Fore.WHITE, True))
 
         
         if snapshot.air_quality_components:
             comp = snapshot.air_quality_components
             if "pm2_5" in comp:
-                rows.append(("   • PM2.5", f"{comp['pm2_5']:.1f} μg/m³", Fore.LIGHTBLACK_EX if use_color else Fore.WHITE))
+                rows.append(("   • PM2.5", f"{comp['pm2_5']:.1f} μg/m³", Fore.LIGHTBLACK_EX, False))
             if "pm10" in comp:
-                rows.append(("   • PM10", f"{comp['pm10']:.1f} μg/m³", Fore.LIGHTBLACK_EX if use_color else Fore.WHITE))
+                rows.append(("   • PM10", f"{comp['pm10']:.1f} μg/m³", Fore.LIGHTBLACK_EX, False))
 
-    key_width = max(len(key) for key, _, _ in rows)
     lines = [header, "=" * 70]
 
-    for key, value, color in rows:
-        if use_color and color != Fore.WHITE and "Style.RESET_ALL" not in value:
-            lines.append(f"{key:<{key_width}} : {color}{value}{Style.RESET_ALL}")
-        else:
-            lines.append(f"{key:<{key_width}} : {value}")
+    prefixes = _WEATHER_ROW_PREFIXES
+    if use_color:
+        reset = _RESET
+        lines.extend(
+            f"{prefixes[key]}{color}{value}{reset}"
+            if not already_colored and color != Fore.WHITE
+            else prefixes[key] + value
+            for key, value, color, already_colored in rows
+        )
+    else:
+        lines.extend(prefixes[key] + value for key, value, _, _ in rows)
 
     # Предупреждения о погоде
     if snapshot.weather_alerts:
         lines.append("\n" + ("=" * 70))
         alert_header = "⚠️  ПОГОДНЫЕ ПРЕДУПРЕЖДЕНИЯ"
         if use_color:
-            alert_header = f"{Fore.RED}{Style.BRIGHT}{alert_header}{Style.RESET_ALL}"
+            alert_header = f"{_ALERT_STYLE}{alert_header}{_RESET}"
         lines.append(alert_header)
         lines.append("=" * 70)
 
@@ -748,7 +1054,7 @@ def format_weather(snapshot: WeatherSnapshot, use_color: bool = True) -> str:
             end = alert.get("end")
 
             if use_color:
-                lines.append(f"{Fore.YELLOW}• {event}{Style.RESET_ALL}")
+                lines.append(f"{_HIGHLIGHT}• {event}{_RESET}")
             else:
                 lines.append(f"• {event}")
 
@@ -762,15 +1068,22 @@ def format_weather(snapshot: WeatherSnapshot, use_color: bool = True) -> str:
     return "\n".join(lines)
 
 
+@lru_cache(maxsize=128)
+def _weather_emoji(description: str) -> str:
+    """Подобрать эмодзи для отформатированного описания погоды.
+
+    Описания берутся из небольшого словаря API, поэтому кэш быстро
+    заполняется и ``lower()`` выполняется один раз на описание.
+    """
+
+    return WEATHER_EMOJI.get(description.lower(), "🌈")
+
+
 def _format_wind_direction(degrees: int) -> str:
     """Вернуть кардинальное направление ветра по градусам."""
 
-    directions = [
-        "С", "ССВ", "СВ", "ВСВ", "В", "ВЮВ", "ЮВ", "ЮЮВ",
-        "Ю", "ЮЮЗ", "ЮЗ", "ЗЮЗ", "З", "ЗСЗ", "СЗ", "ССЗ",
-    ]
-    index = int((degrees % 360) / 22.5 + 0.5) % len(directions)
-    return directions[index]
+    # round(degrees / 22.5) по модулю 16 в целых числах
+    return _WIND_DIRECTIONS[((int(degrees) * 4 + 45) // 90) & 15]
 
 
 def _format_visibility(visibility: int) -> str:
@@ -785,9 +1098,10 @@ def _format_time(moment: Optional[datetime], timezone_label: str) -> str:
 
     if moment is None:
         return "—"
-    return f"{moment.strftime('%H:%M:%S')} ({timezone_label})"
+    return f"{moment.hour:02d}:{moment.minute:02d}:{moment.second:02d} ({timezone_label})"
 
 
+@lru_cache(maxsize=64)
 def _format_timezone(tz: timezone) -> str:
     """Преобразовать объект ``timezone`` в строку вида UTC±HH:MM."""
 
@@ -810,32 +1124,10 @@ def add_air_quality_to_snapshot(
         return snapshot
 
     air_info = air_list[0]
-    aqi = air_info.get("main", {}).get("aqi")
-    components = air_info.get("components", {})
-
-    
-    return WeatherSnapshot(
-        city=snapshot.city,
-        country=snapshot.country,
-        description=snapshot.description,
-        temperature=snapshot.temperature,
-        feels_like=snapshot.feels_like,
-        pressure=snapshot.pressure,
-        humidity=snapshot.humidity,
-        wind_speed=snapshot.wind_speed,
-        wind_direction=snapshot.wind_direction,
-        cloudiness=snapshot.cloudiness,
-        temperature_min=snapshot.temperature_min,
-        temperature_max=snapshot.temperature_max,
-        visibility=snapshot.visibility,
-        sunrise=snapshot.sunrise,
-        sunset=snapshot.sunset,
-        tz=snapshot.tz,
-        units=snapshot.units,
-        uv_index=snapshot.uv_index,
-        air_quality_index=aqi,
-        air_quality_components=components,
-        weather_alerts=snapshot.weather_alerts,
+    return replace(
+        snapshot,
+        air_quality_index=air_info.get("main", {}).get("aqi"),
+        air_quality_components=air_info.get("components", {}),
     )
 
 
@@ -844,30 +1136,10 @@ def add_uv_and_alerts_to_snapshot(
 ) -> WeatherSnapshot:
     """Добавить UV-индекс и предупреждения в снимок."""
     current = onecall_data.get("current", {})
-    uv_index = current.get("uvi")
     alerts = onecall_data.get("alerts", [])
-
-    return WeatherSnapshot(
-        city=snapshot.city,
-        country=snapshot.country,
-        description=snapshot.description,
-        temperature=snapshot.temperature,
-        feels_like=snapshot.feels_like,
-        pressure=snapshot.pressure,
-        humidity=snapshot.humidity,
-        wind_speed=snapshot.wind_speed,
-        wind_direction=snapshot.wind_direction,
-        cloudiness=snapshot.cloudiness,
-        temperature_min=snapshot.temperature_min,
-        temperature_max=snapshot.temperature_max,
-        visibility=snapshot.visibility,
-        sunrise=snapshot.sunrise,
-        sunset=snapshot.sunset,
-        tz=snapshot.tz,
-        units=snapshot.units,
-        uv_index=uv_index,
-        air_quality_index=snapshot.air_quality_index,
-        air_quality_components=snapshot.air_quality_components,
+    return replace(
+        snapshot,
+        uv_index=current.get("uvi"),
         weather_alerts=alerts if alerts else None,
     )
 
@@ -876,31 +1148,36 @@ def parse_forecast_payload(
     payload: Dict[str, Any], tz: timezone, units: str
 ) -> List[ForecastItem]:
     """Разобрать данные прогноза погоды."""
-    forecast_list = payload.get("list", [])
-    items = []
-
-    for item in forecast_list:
-        timestamp = datetime.fromtimestamp(item["dt"], tz=timezone.utc).astimezone(tz)
-        main = item.get("main", {})
-        weather_list = item.get("weather", [])
-        weather_desc = weather_list[0].get("description", "") if weather_list else ""
-
-        items.append(
-            ForecastItem(
-                timestamp=timestamp,
-                temperature=main.get("temp", 0.0),
-                feels_like=main.get("feels_like", 0.0),
-                description=_format_description(weather_desc),
-                humidity=main.get("humidity", 0),
-                wind_speed=item.get("wind", {}).get("speed", 0.0),
-                cloudiness=item.get("clouds", {}).get("all", 0),
-                precipitation_probability=item.get("pop", 0.0) * 100,
-                rain_volume=item.get("rain", {}).get("3h"),
-                snow_volume=item.get("snow", {}).get("3h"),
-            )
+    # Локальные ссылки вместо глобальных имён в цикле по ~40 элементам
+    fromtimestamp = datetime.fromtimestamp
+    format_description = _format_description
+    empty = _EMPTY_BLOCK
+    no_weather = (empty,)
+
+    # Поля ForecastItem передаются позиционно в порядке их объявления
+    return [
+        ForecastItem(
+            fromtimestamp(item["dt"], tz=tz),
+            main.get("temp", 0.0),
+            main.get("feels_like", 0.0),
+            format_description((item.get("weather") or no_weather)[0].get("description", "")),
+            main.get("humidity", 0),
+            item.get("wind", empty).get("speed", 0.0),
+            item.get("clouds", empty).get("all", 0),
+            item.get("pop", 0.0) * 100,
+            item.get("rain", empty).get("3h"),
+            item.get("snow", empty).get("3h"),
         )
+        for item in payload.get("list", [])
+        for main in (item.get("main", empty),)
+    ]
+
+
+@lru_cache(maxsize=64)
+def _day_label(day: date) -> str:
+    """Вернуть подпись дня вида «Friday, 10 October» (strftime с учётом локали)."""
 
-    return items
+    return day.strftime("%A, %d %B")
 
 
 def format_daily_forecast(
@@ -910,51 +1187,56 @@ def format_daily_forecast(
     if not items:
         return "Нет данных прогноза"
 
-    temp_unit, wind_unit = UNITS_LABELS.get(units, ("°", "м/с"))
+    temp_unit, wind_unit = UNITS_LABELS.get(units, _DEFAULT_UNITS_LABELS)
 
-    
-    days: Dict[str, List[ForecastItem]] = {}
-    for item in items:
-        day_key = item.timestamp.strftime("%Y-%m-%d")
-        if day_key not in days:
-            days[day_key] = []
-        days[day_key].append(item)
+    # Пара префикс/суффикс выбирается один раз, а не ветвлением на каждой строке
+    hl_pre, hl_suf = (_HIGHLIGHT, _RESET) if use_color else ("", "")
 
     lines = []
     header = "📅 Прогноз погоды на 5 дней"
     if use_color:
-        header = f"{Fore.CYAN}{Style.BRIGHT}{header}{Style.RESET_ALL}"
+        header = f"{_HEADER_STYLE}{header}{_RESET}"
     lines.append(header)
     lines.append("=" * 60)
 
-    for day_key, day_items in list(days.items())[:5]:
-        date_obj = datetime.strptime(day_key, "%Y-%m-%d")
-        day_name = date_obj.strftime("%A, %d %B")
-
-        temps = [item.temperature for item in day_items]
-        min_temp = min(temps)
-        max_temp = max(temps)
-        avg_temp = sum(temps) / len(temps)
-
-        
-        descriptions = [item.description for item in day_items]
-        main_desc = max(set(descriptions), key=descriptions.count)
-
-        
-        max_precip = max(item.precipitation_probability for item in day_items)
-
-        emoji = WEATHER_EMOJI.get(main_desc.lower(), "🌈")
-
-        if use_color:
-            day_line = f"{Fore.YELLOW}{emoji} {day_name}{Style.RESET_ALL}"
-        else:
-            day_line = f"{emoji} {day_name}"
-
-        lines.append(f"\n{day_line}")
-        lines.append(f"  {main_desc}")
-        lines.append(f"  🌡️  Температура: {min_temp:.1f}{temp_unit} ... {max_temp:.1f}{temp_unit} (средняя {avg_temp:.1f}{temp_unit})")
-        if max_precip > 10:
-            lines.append(f"  💧 Вероятность осадков: {max_precip:.0f}%")
+    # Элементы прогноза идут по времени, поэтому дни группируются потоково,
+    # без промежуточного словаря; дата группы — готовый объект date
+    for day, day_items in islice(groupby(items, key=lambda item: item.timestamp.date()), 5):
+        day_name = _day_label(day)
+
+        # Минимум, максимум, среднее, осадки и частоты описаний — за один проход
+        first = next(day_items)
+        min_temp = max_temp = total_temp = first.temperature
+        count = 1
+        max_precip = first.precipitation_probability
+        desc_counts: Dict[str, int] = {first.description: 1}
+        for item in day_items:
+            temp = item.temperature
+            if temp < min_temp:
+                min_temp = temp
+            elif temp > max_temp:
+                max_temp = temp
+            total_temp += temp
+            count += 1
+            if item.precipitation_probability > max_precip:
+                max_precip = item.precipitation_probability
+            desc_counts[item.description] = desc_counts.get(item.description, 0) + 1
+        avg_temp = total_temp / count
+
+        # Самое частое описание; при равенстве — встретившееся раньше
+        main_desc = max(desc_counts, key=desc_counts.get)
+
+        emoji = _weather_emoji(main_desc)
+
+        day_line = f"{hl_pre}{emoji} {day_name}{hl_suf}"
+
+        # Блок дня добавляется одной строкой со встроенными переводами строк
+        precip_line = f"\n  💧 Вероятность осадков: {max_precip:.0f}%" if max_precip > 10 else ""
+        lines.append(
+            f"\n{day_line}\n  {main_desc}\n"
+            f"  🌡️  Температура: {min_temp:.1f}{temp_unit} ... {max_temp:.1f}{temp_unit} (средняя {avg_temp:.1f}{temp_unit})"
+            f"{precip_line}"
+        )
 
     return "\n".join(lines)
 
@@ -966,41 +1248,42 @@ def format_hourly_forecast(
     if not items:
         return "Нет данных прогноза"
 
-    temp_unit, wind_unit = UNITS_LABELS.get(units, ("°", "м/с"))
+    temp_unit, wind_unit = UNITS_LABELS.get(units, _DEFAULT_UNITS_LABELS)
+
+    hl_pre, hl_suf = (_HIGHLIGHT, _RESET) if use_color else ("", "")
 
     lines = []
     header = "⏰ Почасовой прогноз на 24 часа"
     if use_color:
-        header = f"{Fore.CYAN}{Style.BRIGHT}{header}{Style.RESET_ALL}"
+        header = f"{_HEADER_STYLE}{header}{_RESET}"
     lines.append(header)
     lines.append("=" * 80)
 
-    
+    # Глобальные имена и методы привязаны к локальным до цикла
+    weather_emoji = _weather_emoji
+    append = lines.append
+    time_format = "%H:%M"
     for item in items[:8]:
-        time_str = item.timestamp.strftime("%H:%M")
-        emoji = WEATHER_EMOJI.get(item.description.lower(), "🌈")
-
-        if use_color:
-            time_line = f"{Fore.YELLOW}{time_str}{Style.RESET_ALL}"
-        else:
-            time_line = time_str
-
-        line = f"{time_line} {emoji} {item.temperature:>5.1f}{temp_unit}  {item.description}"
-
-        if item.precipitation_probability > 20:
-            line += f"  💧 {item.precipitation_probability:.0f}%"
-
-        lines.append(line)
+        description = item.description
+        precip = item.precipitation_probability
+        line = (
+            f"{hl_pre}{item.timestamp.strftime(time_format)}{hl_suf} {weather_emoji(description)} "
+            f"{item.temperature:>5.1f}{temp_unit}  {description}"
+        )
+        if precip > 20:
+            line += f"  💧 {precip:.0f}%"
+        append(line)
 
     return "\n".join(lines)
 
 
 def get_uv_label(uv: float) -> Tuple[str, str]:
     """Получить текстовую метку и цвет для UV-индекса."""
-    for min_val, max_val, label, color in UV_LABELS:
-        if min_val <= uv <= max_val:
-            return label, color
-    return "Неизвестно", Fore.WHITE
+    if uv < 0:
+        return "Неизвестно", Fore.WHITE
+    # UV-индекс округляется до ближайшего целого (2.5 -> 3); round() округлял бы
+    # половины к чётному, поэтому используется int(uv + 0.5)
+    return _UV_BANDS[bisect_left(_UV_BREAKS, int(uv + 0.5))]
 
 
 def create_temperature_chart(items: List[ForecastItem], width: int = 60) -> str:
@@ -1008,28 +1291,25 @@ def create_temperature_chart(items: List[ForecastItem], width: int = 60) -> str:
     if not items or len(items) < 2:
         return ""
 
-    temps = [item.temperature for item in items[:8]]  
+    head = items[:8]
+    temps = [item.temperature for item in head]
     min_temp = min(temps)
     max_temp = max(temps)
-    temp_range = max_temp - min_temp if max_temp != min_temp else 1
+    # Если крайние значения совпадают с точностью вывода, рисовать нечего
+    min_label = f"{min_temp:.1f}"
+    if min_label == f"{max_temp:.1f}":
+        return f"📈 Температура стабильна: {min_label}°"
+    temp_range = max_temp - min_temp
 
     
     height = 10
-    chart_lines = [[] for _ in range(height)]
+    # Сетка заполняется пробелами сразу, затем в каждый столбец ставится одна точка
+    chart_lines = [[" "] * len(temps) for _ in range(height)]
 
-    
-    for temp in temps:
-        normalized = (temp - min_temp) / temp_range
-        pos = int(normalized * (height - 1))
-        pos = height - 1 - pos  
-
-        for row in range(height):
-            if row == pos:
-                chart_lines[row].append("●")
-            elif row > pos:
-                chart_lines[row].append(" ")
-            else:
-                chart_lines[row].append(" ")
+    # Строка графика для каждой точки (0 — верхняя)
+    scale = height - 1
+    for col, temp in enumerate(temps):
+        chart_lines[scale - int((temp - min_temp) / temp_range * scale)][col] = "●"
 
     
     lines = []
@@ -1044,7 +1324,7 @@ def create_temperature_chart(items: List[ForecastItem], width: int = 60) -> str:
     lines.append(f"      └{'─' * len(chart_lines[0])}")
 
     
-    times = [item.timestamp.strftime("%H:%M") for item in items[:8]]
+    times = [item.timestamp.strftime("%H:%M") for item in head]
     time_line = "        " + "  ".join(times[::2])  
     lines.append(time_line)
 
@@ -1053,16 +1333,14 @@ def create_temperature_chart(items: List[ForecastItem], width: int = 60) -> str:
 
 def create_humidity_bar(humidity: int, width: int = 30) -> str:
     """Создать горизонтальную полоску для влажности."""
-    filled = int((humidity / 100) * width)
-    bar = "█" * filled + "░" * (width - filled)
-    return f"[{bar}] {humidity}%"
+    width = min(width, _BAR_MAX_WIDTH)
+    filled = min(max(int((humidity / 100) * width), 0), width)
+    return f"[{_FULL_BAR[:filled]}{_EMPTY_BAR[:width - filled]}] {humidity}%"
 
 
 def create_wind_arrow(degrees: int) -> str:
     """Создать стрелку направления ветра."""
-    arrows = ["↓", "↙", "←", "↖", "↑", "↗", "→", "↘"]
-    index = int((degrees % 360) / 45)
-    return arrows[index]
+    return _WIND_ARROWS[int(degrees % 360) // 45]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,95 @@
+"""Асинхронное получение текущей погоды сразу для нескольких городов."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List, Type, Union
+
+import aiohttp
+
+# Модуль намеренно не импортирует main: при запуске ``python main.py`` тот
+# загружен как __main__, и повторный импорт выполнил бы его второй раз.
+# URL, разбор ответа и класс ошибки передаёт вызывающий код.
+Decoder = Callable[[bytes, int], Dict[str, Any]]
+
+MAX_CONCURRENCY = 64
+
+
+async def fetch_weather_async(
+    session: aiohttp.ClientSession,
+    city: str,
+    *,
+    url: str,
+    decode: Decoder,
+    error_type: Type[Exception],
+    api_key: str,
+    units: str,
+    language: str,
+    timeout: float,
+) -> Dict[str, Any]:
+    """Асинхронно запросить текущую погоду для одного города.
+
+    ``decode`` получает тело и HTTP-статус ответа и сам поднимает ``error_type``
+    при ошибке API; сетевые ошибки оборачиваются в ``error_type`` здесь.
+    """
+
+    params = {
+        "q": city,
+        "appid": api_key,
+        "units": units,
+        "lang": language,
+    }
+
+    try:
+        async with session.get(
+            url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            body = await response.read()
+            status = response.status
+    except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+        raise error_type("Не удалось связаться с OpenWeatherMap") from exc
+
+    return decode(body, status)
+
+
+async def fetch_many(
+    cities: Iterable[str],
+    *,
+    url: str,
+    decode: Decoder,
+    error_type: Type[Exception],
+    api_key: str,
+    units: str,
+    language: str,
+    timeout: float,
+) -> List[Union[Dict[str, Any], Exception]]:
+    """Получить погоду для списка городов параллельно.
+
+    Результаты идут в том же порядке, что и ``cities``; для города, по которому
+    запрос не удался, вместо данных возвращается экземпляр ``error_type``.
+    """
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def fetch_one(
+        session: aiohttp.ClientSession, city: str
+    ) -> Union[Dict[str, Any], Exception]:
+        async with semaphore:
+            try:
+                return await fetch_weather_async(
+                    session,
+                    city,
+                    url=url,
+                    decode=decode,
+                    error_type=error_type,
+                    api_key=api_key,
+                    units=units,
+                    language=language,
+                    timeout=timeout,
+                )
+            except error_type as exc:
+                return exc
+
+    connector = aiohttp.TCPConnector(limit_per_host=MAX_CONCURRENCY)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(*(fetch_one(session, city) for city in cities))